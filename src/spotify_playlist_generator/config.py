@@ -9,6 +9,11 @@ SPOTIPY_REFRESH_TOKEN = os.getenv("SPOTIPY_REFRESH_TOKEN")
 SPOTIPY_REDIRECT_URI = "http://127.0.0.1:8888/callback"
 SPOTIFY_USERNAME = "31oya3ie2f5wwlqt6tnfurou6zzq"  # Deejey Marvel Automations
 SPOTIFY_PLAYLIST_ID = "3gmOQhmxoEN1KTikr1S2QL"  # TestPlaylist
+SPOTIFY_SEARCH_WORKERS = 8  # concurrent track searches per file
+SYNC_FILE_WORKERS = 4  # M3U files processed concurrently
+SPOTIFY_PAGE_WORKERS = 4  # concurrent playlist page fetches
+SPOTIFY_SEARCH_RATE = 10.0  # track searches per second, across all workers
+SPOTIFY_SEARCH_BURST = 20
 
 HISTORY_TO_SPOTIFY_FOLDER_ID = "15U-VPMLszK6q66pwIp5OcQpHGTBW6vLs"
 HISTORY_TO_SPOTIFY_SPREADSHEET_NAME = "DJM Radio Logging"
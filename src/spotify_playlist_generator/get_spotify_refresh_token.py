@@ -1,23 +1,50 @@
-import config
+from __future__ import annotations
+
+import os
+
 from dotenv import load_dotenv
 from spotipy import SpotifyOAuth
 
-# Load credentials from your local .env file
-load_dotenv()
-
-sp_oauth = SpotifyOAuth(
-    client_id=config.SPOTIPY_CLIENT_ID,
-    client_secret=config.SPOTIPY_CLIENT_SECRET,
-    redirect_uri=config.SPOTIPY_REDIRECT_URI,
-    scope="playlist-modify-public playlist-modify-private",
-    open_browser=True,  # Set to False if you'd prefer a manual link
-)
+from spotify_playlist_generator import config
 
-token_info = sp_oauth.get_access_token(as_dict=True)
 
-if token_info:
-    print("✅ REFRESH TOKEN:", token_info.get("refresh_token"))
-else:
-    print(
-        "❌ Failed to retrieve token. Please check your credentials and redirect URI."
+def get_refresh_token(cached: bool = False) -> str | None:
+    """
+    Run the Spotify OAuth flow and return the refresh token.
+    With cached=True only the local token cache is consulted (no browser flow).
+    Credentials are read from the environment at call time, so a .env loaded by
+    main() is honoured.
+    """
+    sp_oauth = SpotifyOAuth(
+        client_id=os.getenv("SPOTIPY_CLIENT_ID"),
+        client_secret=os.getenv("SPOTIPY_CLIENT_SECRET"),
+        redirect_uri=config.SPOTIPY_REDIRECT_URI,
+        scope="playlist-modify-public playlist-modify-private",
+        open_browser=True,  # Set to False if you'd prefer a manual link
     )
+
+    if cached:
+        token_info = sp_oauth.get_cached_token()
+    else:
+        token_info = sp_oauth.get_access_token(as_dict=True)
+
+    if not token_info:
+        return None
+    return token_info.get("refresh_token")
+
+
+def main() -> None:
+    # Load credentials from your local .env file
+    load_dotenv()
+
+    refresh_token = get_refresh_token()
+    if refresh_token:
+        print("✅ REFRESH TOKEN:", refresh_token)
+    else:
+        print(
+            "❌ Failed to retrieve token. Please check your credentials and redirect URI."
+        )
+
+
+if __name__ == "__main__":
+    main()
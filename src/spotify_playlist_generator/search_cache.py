@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from kaiano import logger as logger_mod
+
+log = logger_mod.get_logger()
+
+# Misses are retried after this long, in case the track has since appeared on Spotify.
+MISS_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def load_search_cache(path: str) -> dict[tuple[str, str], str | None]:
+    """
+    Load cached (artist, title) -> Spotify URI lookups from a SQLite file.
+    Returns an empty cache if the file does not exist or cannot be read.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    min_miss_ts = time.time() - MISS_TTL_SECONDS
+    try:
+        with closing(sqlite3.connect(path)) as conn:
+            rows = conn.execute(
+                "SELECT artist, title, uri FROM track_cache "
+                "WHERE uri IS NOT NULL OR ts >= ?",
+                (min_miss_ts,),
+            ).fetchall()
+    except sqlite3.Error as e:
+        log.warning("⚠️ Ignoring unreadable search cache %s: %s", path, e)
+        return {}
+
+    return {(artist, title): uri for artist, title, uri in rows}
+
+
+def save_search_cache(path: str, entries: dict[tuple[str, str], str | None]) -> None:
+    """Insert or refresh the given lookups in the SQLite cache file."""
+    if not entries:
+        return
+
+    now = time.time()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(sqlite3.connect(path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS track_cache ("
+                "artist TEXT, title TEXT, uri TEXT, ts REAL, "
+                "PRIMARY KEY (artist, title))"
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO track_cache VALUES (?, ?, ?, ?)",
+                [(artist, title, uri, now) for (artist, title), uri in entries.items()],
+            )
+    except (OSError, sqlite3.Error) as e:
+        log.warning("⚠️ Failed to save search cache %s: %s", path, e)
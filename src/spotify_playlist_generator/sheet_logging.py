@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import random
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 
 from kaiano import logger as logger_mod
@@ -8,6 +11,43 @@ from kaiano.google import GoogleAPI
 
 log = logger_mod.get_logger()
 
+REQUIRED_SHEETS: dict[str, list[str]] = {
+    "Info": ["Timestamp", "Message", "Processed", "Found", "Unfound"],
+    "Processed": ["Filename", "Playlist ID", "ExtVDJLine"],
+    "Songs Added": ["Date", "Title", "Artist"],
+    "Songs Not Found": ["Date", "Title", "Artist"],
+}
+
+# Row count Sheets gives a tab added without explicit gridProperties.
+DEFAULT_SHEET_ROWS = 1000
+
+
+def _row_data(values: list[str]) -> dict:
+    """Build a Sheets RowData payload holding the given values as plain strings."""
+    return {"values": [{"userEnteredValue": {"stringValue": v}} for v in values]}
+
+
+def _sheet_ids_by_title(metadata: dict) -> dict[str, int]:
+    """Map sheet titles to sheet ids from a spreadsheets.get response."""
+    sheet_ids: dict[str, int] = {}
+    for sheet_info in metadata.get("sheets", []):
+        props = sheet_info.get("properties", {})
+        sheet_id = props.get("sheetId")
+        if sheet_id is not None:
+            sheet_ids[props.get("title", "")] = sheet_id
+    return sheet_ids
+
+
+def _grid_rows_by_title(metadata: dict) -> dict[str, int]:
+    """Map sheet titles to their grid row counts from a spreadsheets.get response."""
+    row_counts: dict[str, int] = {}
+    for sheet_info in metadata.get("sheets", []):
+        props = sheet_info.get("properties", {})
+        row_count = props.get("gridProperties", {}).get("rowCount")
+        if row_count is not None:
+            row_counts[props.get("title", "")] = row_count
+    return row_counts
+
 
 class SpreadsheetLogger:
     def __init__(
@@ -20,20 +60,38 @@ class SpreadsheetLogger:
         self.g = g
         self.folder_id = folder_id
         self.spreadsheet_name = spreadsheet_name
+        self._sheet_ids: dict[str, int] = {}
+        self._meta_cache: tuple[float, dict] | None = None
+        self._processed_rows: dict[str, list[str]] | None = None
+        self._processed_dirty = False
+        self._processed_grid_rows = DEFAULT_SHEET_ROWS
+        self._pending: list[dict] = []
+        self._batch_depth = 0
 
         self.spreadsheet_id = self._get_logging_spreadsheet()
 
+    def _metadata(self, max_age: float = 2.0) -> dict:
+        """Return spreadsheet metadata, reusing a fetch made within max_age seconds."""
+        now = time.monotonic()
+        if self._meta_cache is not None and now - self._meta_cache[0] <= max_age:
+            return self._meta_cache[1]
+        metadata = self.g.sheets.get_metadata(self.spreadsheet_id)
+        self._meta_cache = (now, metadata)
+        return metadata
+
+    def _invalidate_metadata(self) -> None:
+        self._meta_cache = None
+
     def delete_sheet_by_name(self, sheet_name: str) -> None:
         """Delete a sheet tab by its title."""
-        meta = self.g.sheets.get_metadata(self.spreadsheet_id)
-        for sheet in meta.get("sheets", []):
-            props = sheet.get("properties", {})
-            if props.get("title") == sheet_name:
-                sheet_id = props.get("sheetId")
-                self.g.sheets.batch_update(
-                    self.spreadsheet_id, [{"deleteSheet": {"sheetId": sheet_id}}]
-                )
-                return
+        sheet_id = _sheet_ids_by_title(self._metadata()).get(sheet_name)
+        if sheet_id is None:
+            return
+        self.g.sheets.batch_update(
+            self.spreadsheet_id, [{"deleteSheet": {"sheetId": sheet_id}}]
+        )
+        self._invalidate_metadata()
+        self._sheet_ids.pop(sheet_name, None)
 
     def _get_logging_spreadsheet(self) -> str:
         """
@@ -64,70 +122,116 @@ class SpreadsheetLogger:
 
         self._setup_logging_spreadsheet()
         log.info(
-            f"Created new logging spreadsheet '{self.spreadsheet_name}' in folder {self.folder_id}."
+            "Created new logging spreadsheet '%s' in folder %s.",
+            self.spreadsheet_name,
+            self.folder_id,
         )
         return spreadsheet_id
 
     def _wait_for_spreadsheet_ready(
-        self, spreadsheet_id: str, retries: int = 5, delay: int = 1
+        self,
+        spreadsheet_id: str,
+        initial: float = 0.05,
+        base: float = 1.3,
+        max_wait: float = 30.0,
     ) -> bool:
-        """Poll until the spreadsheet metadata can be fetched."""
-        for attempt in range(1, retries + 1):
+        """
+        Poll with exponential backoff until the spreadsheet metadata can be fetched.
+        Sleeps initial * base**attempt (plus up to 25% jitter) between tries, giving
+        up after max_wait seconds.
+        """
+        waited = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
             try:
-                self.g.sheets.get_metadata(spreadsheet_id)
+                metadata = self.g.sheets.get_metadata(spreadsheet_id)
+                self._meta_cache = (time.monotonic(), metadata)
                 return True
             except Exception:
+                if waited >= max_wait:
+                    return False
+                delay = initial * base ** (attempt - 1)
+                delay = min(delay + random.uniform(0, delay / 4), max_wait - waited)
                 log.warning(
-                    f"Waiting for spreadsheet to propagate ({attempt}/{retries})..."
+                    "Waiting for spreadsheet to propagate (attempt %d, %.2fs)...",
+                    attempt,
+                    delay,
                 )
                 time.sleep(delay)
-        return False
+                waited += delay
 
     def _setup_logging_spreadsheet(self) -> None:
         """
         Ensure the logging spreadsheet contains only the required sheets with correct headers.
+        Missing sheets (with their header rows) are added in a single batchUpdate and
+        extraneous sheets deleted in a second, best-effort one; nothing is sent when the
+        layout is already correct.
         """
-        required_sheets = {
-            "Info": ["Timestamp", "Message", "Processed", "Found", "Unfound"],
-            "Processed": ["Filename", "Playlist ID", "ExtVDJLine"],
-            "Songs Added": ["Date", "Title", "Artist"],
-            "Songs Not Found": ["Date", "Title", "Artist"],
-        }
-        for sheet_name, headers in required_sheets.items():
-            self.g.sheets.ensure_sheet_exists(
-                self.spreadsheet_id, sheet_name, headers=headers
+        metadata = self._metadata()
+        sheet_ids = _sheet_ids_by_title(metadata)
+        self._processed_grid_rows = _grid_rows_by_title(metadata).get(
+            "Processed", DEFAULT_SHEET_ROWS
+        )
+
+        requests: list[dict] = []
+        next_sheet_id = max(sheet_ids.values(), default=0) + 1
+        for sheet_name, headers in REQUIRED_SHEETS.items():
+            if sheet_name in sheet_ids:
+                continue
+            sheet_ids[sheet_name] = next_sheet_id
+            requests.append(
+                {
+                    "addSheet": {
+                        "properties": {"sheetId": next_sheet_id, "title": sheet_name}
+                    }
+                }
             )
-        try:
-            metadata = self.g.sheets.get_metadata(self.spreadsheet_id)
-            for sheet_info in metadata.get("sheets", []):
-                props = sheet_info.get("properties", {})
-                title = props.get("title", "")
-                sheet_id = props.get("sheetId")
-
-                if title not in required_sheets and sheet_id is not None:
-                    self.g.sheets.batch_update(
-                        self.spreadsheet_id,
-                        [{"deleteSheet": {"sheetId": sheet_id}}],
-                    )
-                    log.info(f"🗑 Deleted extraneous sheet '{title}'.")
-        except Exception as e:
-            log.error(f"⚠️ Failed to clean up sheets: {e}")
-
-    def _append_values(
-        self,
-        range_name: str,
-        values: list[list[str]],
-        value_input_option: str = "RAW",
-    ) -> None:
-        try:
-            self.g.sheets.append_values(
-                self.spreadsheet_id,
-                range_name,
-                values,
-                value_input_option=value_input_option,
+            requests.append(
+                {
+                    "updateCells": {
+                        "start": {
+                            "sheetId": next_sheet_id,
+                            "rowIndex": 0,
+                            "columnIndex": 0,
+                        },
+                        "rows": [_row_data(headers)],
+                        "fields": "userEnteredValue",
+                    }
+                }
             )
-        except Exception as e:
-            log.error(f"⚠️ Failed to append values to {range_name}: {e}")
+            next_sheet_id += 1
+
+        if requests:
+            self.g.sheets.batch_update(self.spreadsheet_id, requests)
+            self._invalidate_metadata()
+
+        # Cleanup is sent separately so an undeletable tab cannot block setup.
+        extraneous = [title for title in sheet_ids if title not in REQUIRED_SHEETS]
+        if extraneous:
+            try:
+                self.g.sheets.batch_update(
+                    self.spreadsheet_id,
+                    [{"deleteSheet": {"sheetId": sheet_ids[t]}} for t in extraneous],
+                )
+                self._invalidate_metadata()
+                for title in extraneous:
+                    sheet_ids.pop(title)
+                    log.info("🗑 Deleted extraneous sheet '%s'.", title)
+            except Exception as e:
+                log.warning("⚠️ Failed to clean up sheets: %s", e)
+
+        self._sheet_ids = sheet_ids
+
+    def _append_cells(self, sheet_name: str, rows: list[list[str]]) -> dict:
+        """Build an appendCells request adding rows after the last row of a sheet."""
+        return {
+            "appendCells": {
+                "sheetId": self._sheet_ids[sheet_name],
+                "rows": [_row_data(row) for row in rows],
+                "fields": "userEnteredValue",
+            }
+        }
 
     def log_spreadsheet(
         self,
@@ -140,42 +244,33 @@ class SpreadsheetLogger:
         songs_not_found: list[list[str]] | None = None,
         processed_update: dict | None = None,
     ) -> None:
-        """Unified spreadsheet logger."""
-        timestamp = datetime.now().replace(microsecond=0).isoformat(sep=" ")
+        """
+        Unified spreadsheet logger.
+        All writes for one call are flushed to Sheets immediately, or queued until the
+        enclosing batched() block exits.
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        requests: list[dict] = []
 
         # --- Info tab ---
+        # The required tabs were created by _setup_logging_spreadsheet.
         if info_message is not None:
-            self.g.sheets.ensure_sheet_exists(
-                self.spreadsheet_id,
-                "Info",
-                headers=["Timestamp", "Message", "Processed", "Found", "Unfound"],
-            )
             row = [
-                [
-                    timestamp,
-                    info_message,
-                    processed_summary or "",
-                    found_summary or "",
-                    unfound_summary or "",
-                ]
+                timestamp,
+                info_message,
+                processed_summary or "",
+                found_summary or "",
+                unfound_summary or "",
             ]
-            self._append_values("Info!A1", row, value_input_option="RAW")
+            requests.append(self._append_cells("Info", [row]))
 
         # --- Songs Added ---
         if songs_added:
-            self._append_values(
-                "Songs Added!A1",
-                songs_added,
-                value_input_option="RAW",
-            )
+            requests.append(self._append_cells("Songs Added", songs_added))
 
         # --- Songs Not Found ---
         if songs_not_found:
-            self._append_values(
-                "Songs Not Found!A1",
-                songs_not_found,
-                value_input_option="RAW",
-            )
+            requests.append(self._append_cells("Songs Not Found", songs_not_found))
 
         # --- Processed ---
         if processed_update:
@@ -187,37 +282,97 @@ class SpreadsheetLogger:
                 log.error(
                     "⚠️ processed_update missing required keys: filename/extvdj_line"
                 )
-                return
+            else:
+                self._processed()[filename] = [filename, playlist_id or "", extvdj_line]
+                self._processed_dirty = True
 
-            all_rows = self.g.sheets.read_values(self.spreadsheet_id, "Processed!A2:C")
-            filenames = [row[0] for row in all_rows if row]
+        self._pending.extend(requests)
+        if self._batch_depth == 0:
+            self.flush()
 
-            updated_row = [filename, playlist_id or "", extvdj_line]
+    @contextmanager
+    def batched(self) -> Iterator[None]:
+        """Queue log writes made inside the block and flush them together on exit."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
 
-            if filename in filenames:
-                row_index = filenames.index(filename) + 2
-                self.g.sheets.write_values(
-                    self.spreadsheet_id,
-                    f"Processed!A{row_index}:C{row_index}",
-                    [updated_row],
-                    value_input_option="RAW",
-                )
-            else:
-                self._append_values(
-                    "Processed!A1",
-                    [updated_row],
-                    value_input_option="RAW",
-                )
+    def flush(self) -> None:
+        """
+        Send all queued log writes in one batchUpdate, then the Processed rewrite.
+        Log rows are best-effort, but a failed Processed write is raised: losing it
+        would make the next run re-sync every file.
+        """
+        requests = self._pending
+        processed = self._processed_requests() if self._processed_dirty else None
+        self._pending = []
+        self._processed_dirty = False
+
+        if requests:
             try:
-                self.g.sheets.sort_sheet(
-                    self.spreadsheet_id,
-                    "Processed",
-                    column_index=2,
-                    ascending=False,
-                    start_row=2,
-                )
+                self.g.sheets.batch_update(self.spreadsheet_id, requests)
             except Exception as e:
-                log.error(f"⚠️ Failed to sort Processed sheet: {e}")
+                log.error("⚠️ Failed to write log entries to spreadsheet: %s", e)
+
+        if processed is not None:
+            processed_requests, grid_rows = processed
+            try:
+                self.g.sheets.batch_update(self.spreadsheet_id, processed_requests)
+            except Exception:
+                self._processed_dirty = True
+                raise
+            self._processed_grid_rows = max(self._processed_grid_rows, grid_rows)
+
+    def _processed(self) -> dict[str, list[str]]:
+        """Return the Processed rows keyed by filename, reading the sheet only once."""
+        if self._processed_rows is None:
+            rows = self.g.sheets.read_values(self.spreadsheet_id, "Processed!A2:C")
+            self._processed_rows = {
+                row[0]: (list(row) + ["", ""])[:3] for row in rows if row
+            }
+        return self._processed_rows
+
+    def _processed_requests(self) -> tuple[list[dict], int]:
+        """
+        Build the requests rewriting the Processed sheet from the in-memory rows.
+        Rows are sorted locally (newest ExtVDJLine first) and written in one updateCells,
+        which replaces both a per-update read and the server-side sort. updateCells
+        cannot write past the grid, so rows are appended first when it is too short.
+        Returns the requests and the row count the grid has once they succeed.
+        """
+        rows = sorted(self._processed().values(), key=lambda row: row[2], reverse=True)
+        sheet_id = self._sheet_ids["Processed"]
+        grid_rows = len(rows) + 1  # header row
+        requests: list[dict] = []
+        if grid_rows > self._processed_grid_rows:
+            requests.append(
+                {
+                    "appendDimension": {
+                        "sheetId": sheet_id,
+                        "dimension": "ROWS",
+                        "length": grid_rows - self._processed_grid_rows,
+                    }
+                }
+            )
+        requests.append(
+            {
+                "updateCells": {
+                    "range": {
+                        "sheetId": sheet_id,
+                        "startRowIndex": 1,
+                        "startColumnIndex": 0,
+                        "endColumnIndex": 3,
+                    },
+                    "rows": [_row_data(row) for row in rows],
+                    "fields": "userEnteredValue",
+                }
+            }
+        )
+        return requests, grid_rows
 
     def log_info_sheet(
         self,
@@ -226,7 +381,12 @@ class SpreadsheetLogger:
         found: str = None,
         unfound: str = None,
     ):
-        if all(v is not None for v in [message, processed, found, unfound]):
+        if (
+            message is not None
+            and processed is not None
+            and found is not None
+            and unfound is not None
+        ):
             self.log_spreadsheet(
                 info_message=message,
                 processed_summary=processed,
@@ -244,11 +404,13 @@ class SpreadsheetLogger:
         log.debug("Starting debug logging for Westie Radio sync.")
 
     def load_processed_map(self) -> dict:
-        processed_rows = self.g.sheets.read_values(
-            self.spreadsheet_id, "Processed!A2:C"
-        )
-        processed_map = {row[0]: row[2] for row in processed_rows if len(row) >= 3}
-        return processed_map
+        """
+        Map filename -> last processed ExtVDJ line.
+        Reads through the in-memory Processed cache, so later updates need no re-read.
+        """
+        return {
+            filename: row[2] for filename, row in self._processed().items() if row[2]
+        }
 
     def log_to_sheets(
         self,
@@ -261,6 +423,9 @@ class SpreadsheetLogger:
         last_extvdj_line,
         playlist_id=None,
     ):
+        # Nothing new in this file: no Info row, no Processed change.
+        if not new_songs and not matched_songs and not unfound:
+            return
 
         self.log_spreadsheet(
             info_message=f"🎶 Processed file: {filename}",
@@ -2,8 +2,13 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
 import kaiano.logger as log
@@ -13,6 +18,8 @@ from kaiano.spotify import SpotifyAPI
 from kaiano.vdj.m3u.m3u import M3UToolbox
 
 from spotify_playlist_generator import config
+from spotify_playlist_generator.rate_limit import TokenBucket
+from spotify_playlist_generator.search_cache import load_search_cache, save_search_cache
 from spotify_playlist_generator.sheet_logging import SpreadsheetLogger
 
 log = log.get_logger()
@@ -24,6 +31,18 @@ DEFAULT_PLAYLIST_DESCRIPTION = (
     "www.kaianolevine.com/dj-marvel"
 )
 
+_DATE_PREFIX_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})")
+_DIGITS_RE = re.compile(r"(\d+)")
+
+# Spotify accepts at most 100 URIs per "add items to playlist" request.
+SPOTIFY_ADD_BATCH_SIZE = 100
+
+# Files are scanned on a thread pool. The Google API client is not thread-safe.
+_google_lock = threading.Lock()
+
+# Shared by every search worker so the combined rate stays under Spotify's limit.
+_search_limiter = TokenBucket(config.SPOTIFY_SEARCH_RATE, config.SPOTIFY_SEARCH_BURST)
+
 
 # ---------------------------
 # Playlist snapshot utilities
@@ -34,21 +53,37 @@ def _now_utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _first_attr(obj: Any, names: list[str]) -> Any:
-    """Return the first existing attribute value on obj from a list of names."""
-    for n in names:
-        if hasattr(obj, n):
-            return getattr(obj, n)
-    return None
+_PLAYLIST_HELPER_NAMES = [
+    "get_all_playlists",
+    "get_user_playlists",
+    "list_playlists",
+    "get_playlists",
+    "fetch_playlists",
+]
+_CLIENT_ATTR_NAMES = ["client", "spotify", "sp", "_client", "_sp"]
+
+# Attribute names resolved per wrapper type, so the hasattr probing runs once.
+_resolved_names: dict[tuple[type, str], str | None] = {}
+
 
+def _resolve_name(obj: Any, kind: str, names: list[str], need_callable: bool) -> Any:
+    """Return the first matching attribute of obj, caching which name matched."""
+    key = (type(obj), kind)
+    if key not in _resolved_names:
+        _resolved_names[key] = None
+        for n in names:
+            if callable(getattr(obj, n, None)) or (
+                not need_callable and hasattr(obj, n)
+            ):
+                _resolved_names[key] = n
+                break
+    name = _resolved_names[key]
+    return getattr(obj, name, None) if name else None
 
-def _call_first(sp: Any, method_names: list[str], *args: Any, **kwargs: Any) -> Any:
-    """Call the first method that exists on sp; return its result."""
-    for name in method_names:
-        fn = getattr(sp, name, None)
-        if callable(fn):
-            return fn(*args, **kwargs)
-    raise AttributeError(f"None of these methods exist on SpotifyAPI: {method_names}")
+
+def _spotipy_client(sp: Any) -> Any:
+    """Return the underlying spotipy-like client of a SpotifyAPI wrapper, if any."""
+    return _resolve_name(sp, "client", _CLIENT_ATTR_NAMES, need_callable=False)
 
 
 def _extract_external_url(playlist: dict) -> str:
@@ -90,27 +125,24 @@ def fetch_all_playlists(sp: Any) -> list[dict]:
     Expected return shape is a list of raw Spotify playlist dicts.
     """
     # 1) If your wrapper already has a direct helper, prefer it.
-    try:
-        return _call_first(
-            sp,
-            [
-                "get_all_playlists",
-                "get_user_playlists",
-                "list_playlists",
-                "get_playlists",
-                "fetch_playlists",
-            ],
-        )
-    except Exception:
-        pass
-
-    # 2) Try to find an underlying spotipy-like client.
-    client = _first_attr(sp, ["client", "spotify", "sp", "_client", "_sp"])
-    if client is None:
-        return []
-
+    helper = _resolve_name(sp, "playlists", _PLAYLIST_HELPER_NAMES, need_callable=True)
+    client = _spotipy_client(sp)
     # spotipy style: current_user_playlists(limit=50, offset=0) -> {items: [...], next: ...}
-    fn = getattr(client, "current_user_playlists", None)
+    fn = getattr(client, "current_user_playlists", None) if client is not None else None
+
+    if helper is not None:
+        try:
+            return helper()
+        except Exception as e:
+            # Some helpers need arguments (e.g. a user id); the client path does not.
+            # Without a client, raise rather than report an empty account.
+            if not callable(fn):
+                raise
+            log.warning(
+                "⚠️ Playlist helper failed, listing through the client instead: %s", e
+            )
+
+    # 2) Fall back to an underlying spotipy-like client.
     if not callable(fn):
         return []
 
@@ -118,27 +150,83 @@ def fetch_all_playlists(sp: Any) -> list[dict]:
     limit = 50
     offset = 0
 
+    def _page_items(page: Any) -> list[dict]:
+        page_items = page.get("items") if isinstance(page, dict) else None
+        return page_items if isinstance(page_items, list) else []
+
+    first = fn(limit=limit, offset=offset)
+    items.extend(_page_items(first))
+    if not isinstance(first, dict) or not first.get("next"):
+        return items
+
+    # The first page reports the total, so the remaining offsets can be fetched
+    # concurrently instead of following `next` one page at a time.
+    total = first.get("total")
+    if isinstance(total, int):
+        offsets = range(limit, total, limit)
+        workers = min(config.SPOTIFY_PAGE_WORKERS, len(offsets)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pages = executor.map(lambda off: fn(limit=limit, offset=off), offsets)
+            for page in pages:
+                items.extend(_page_items(page))
+        return items
+
     while True:
+        offset += limit
         page = fn(limit=limit, offset=offset)
+        items.extend(_page_items(page))
+        # Prefer Spotify pagination semantics when available.
+        if not isinstance(page, dict) or not page.get("next"):
+            break
+
+    return items
+
+
+def fetch_playlist_track_uris(sp: Any, playlist_id: str) -> set[str]:
+    """Return the track URIs already in a playlist.
+
+    Uses the underlying spotipy-like client when available; returns an empty set
+    otherwise, in which case callers simply add every track.
+    """
+    fn = getattr(_spotipy_client(sp), "playlist_items", None)
+    if not callable(fn):
+        return set()
+
+    uris: set[str] = set()
+    offset = 0
+    while True:
+        page = fn(
+            playlist_id, fields="items(track(uri)),next", limit=100, offset=offset
+        )
         if not isinstance(page, dict):
             break
+        for item in page.get("items") or []:
+            uri = ((item or {}).get("track") or {}).get("uri")
+            if uri:
+                uris.add(uri)
+        if not page.get("next"):
+            break
+        offset += 100
 
-        page_items = page.get("items") or []
-        if isinstance(page_items, list):
-            items.extend(page_items)
+    return uris
 
-        # Prefer Spotify pagination semantics when available.
-        if page.get("next"):
-            offset += limit
-            continue
 
-        break
+def index_playlists_by_name(playlists: list[dict]) -> dict[str, str]:
+    """Map playlist name -> id, keeping the first playlist for duplicate names."""
+    by_name: dict[str, str] = {}
+    for p in playlists:
+        if isinstance(p, dict) and p.get("name") and p.get("id"):
+            by_name.setdefault(p["name"], p["id"])
+    return by_name
 
-    return items
 
+def write_playlist_snapshot_json(
+    sp: Any, raw_playlists: list[dict] | None = None
+) -> str | None:
+    """Write a JSON snapshot of all playlists to disk and return the output path.
 
-def write_playlist_snapshot_json(sp: Any) -> str | None:
-    """Write a JSON snapshot of all playlists to disk and return the output path."""
+    Pass raw_playlists when they were already fetched to avoid listing them again.
+    """
     # Determine output path.
     json_output_path = (
         os.getenv("SPOTIFY_PLAYLIST_SNAPSHOT_JSON_PATH")
@@ -146,7 +234,8 @@ def write_playlist_snapshot_json(sp: Any) -> str | None:
         or "site_data/spotify_playlists.json"
     )
 
-    raw_playlists = fetch_all_playlists(sp)
+    if raw_playlists is None:
+        raw_playlists = fetch_all_playlists(sp)
     normalized = [
         _normalize_playlist_item(p) for p in raw_playlists if isinstance(p, dict)
     ]
@@ -159,24 +248,48 @@ def write_playlist_snapshot_json(sp: Any) -> str | None:
         ),
     }
 
+    # Write to a temp file and rename so readers never see a partial snapshot.
+    tmp_path = f"{json_output_path}.tmp"
     try:
         os.makedirs(os.path.dirname(json_output_path) or ".", exist_ok=True)
-        with open(json_output_path, "w", encoding="utf-8") as f:
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, json_output_path)
         return json_output_path
     except Exception:
         log.exception(
-            f"❌ Failed to write playlist snapshot JSON to: {json_output_path}"
+            "❌ Failed to write playlist snapshot JSON to: %s", json_output_path
         )
+        with suppress(OSError):
+            Path(tmp_path).unlink(missing_ok=True)
         return None
 
 
 def extract_date_from_filename(filename: str) -> str:
     """Extract YYYY-MM-DD prefix from a filename if present."""
     base = os.path.basename(filename)
-    if len(base) >= 10 and base[4] == "-" and base[7] == "-":
-        return base[:10]
-    return base
+    match = _DATE_PREFIX_RE.match(base)
+    return match.group(1) if match else base
+
+
+def _natural_sort_key(name: str) -> list[int | str]:
+    """Sort key comparing digit runs numerically, so set9 sorts before set10."""
+    return [
+        int(part) if part.isdigit() else part.casefold()
+        for part in _DIGITS_RE.split(name)
+    ]
+
+
+def list_m3u_files(g: GoogleAPI) -> list[dict]:
+    """List the .m3u history files in the VDJ history folder, in natural order."""
+    files = g.drive.list_files(config.VDJ_HISTORY_FOLDER_ID, trashed=False)
+    m3u_files = [
+        {"id": f.id, "name": f.name}
+        for f in files
+        if (f.name or "").lower().endswith(".m3u")
+    ]
+    m3u_files.sort(key=lambda f: _natural_sort_key(f["name"]))
+    return m3u_files
 
 
 def process_new_songs(
@@ -189,15 +302,63 @@ def process_new_songs(
     if not last_extvdj_line:
         return songs
 
-    try:
-        idx = next(
-            i
-            for i, (_artist, _title, line) in enumerate(songs)
-            if line == last_extvdj_line
+    # The last processed line is usually at or near the end, so scan backwards.
+    for i in range(len(songs) - 1, -1, -1):
+        if songs[i][2] == last_extvdj_line:
+            return songs[i + 1 :]
+    log.debug(
+        "⚠️ Last logged song not found among %d songs, processing all.", len(songs)
+    )
+    return songs
+
+
+def _search_key(artist: str, title: str) -> tuple[str, str]:
+    return (artist or "").casefold().strip(), (title or "").casefold().strip()
+
+
+def search_tracks(
+    sp: SpotifyAPI,
+    songs: list[tuple[str, str, str]],
+    cache: dict[tuple[str, str], str | None] | None = None,
+) -> list[str | None]:
+    """Look up Spotify URIs for (artist, title, extvdj_line) songs, in input order.
+
+    Searches are independent HTTPS round-trips, so they run on a small thread pool.
+    When a cache is given, hits and misses are both remembered (keyed on the
+    case-folded artist/title), so tracks repeated across files are searched once.
+    """
+    if not songs:
+        return []
+    if cache is None:
+        cache = {}
+
+    keys = [_search_key(artist, title) for artist, title, _ in songs]
+
+    # One query per distinct uncached track, even if it repeats within the batch.
+    to_search: dict[tuple[str, str], tuple[str, str]] = {}
+    for (artist, title, _), key in zip(songs, keys):
+        if key not in cache:
+            to_search.setdefault(key, (artist, title))
+
+    def _search(pair: tuple[str, str]) -> str | None:
+        _search_limiter.acquire()
+        return sp.search_track(*pair)
+
+    if to_search:
+        workers = min(config.SPOTIFY_SEARCH_WORKERS, len(to_search))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            uris = executor.map(_search, to_search.values())
+            for key, uri in zip(to_search, uris):
+                cache[key] = uri
+    return [cache[key] for key in keys]
+
+
+def add_tracks_in_batches(sp: SpotifyAPI, playlist_id: str, uris: list[str]) -> None:
+    """Add tracks to a playlist in requests of at most SPOTIFY_ADD_BATCH_SIZE URIs."""
+    for i in range(0, len(uris), SPOTIFY_ADD_BATCH_SIZE):
+        sp.add_tracks_to_specific_playlist(
+            playlist_id, uris[i : i + SPOTIFY_ADD_BATCH_SIZE]
         )
-        return songs[idx + 1 :]
-    except StopIteration:
-        return songs
 
 
 def update_spotify_radio_playlist(
@@ -207,110 +368,172 @@ def update_spotify_radio_playlist(
     if not found_uris:
         return
 
+    unique_uris = list(dict.fromkeys(found_uris))
     try:
-        sp.add_tracks_to_specific_playlist(playlist_id, found_uris)
+        add_tracks_in_batches(sp, playlist_id, unique_uris)
         sp.trim_playlist_to_limit()
     except Exception as e:
-        log.error(f"❌ Error updating Spotify radio playlist: {e}", exc_info=True)
+        log.error("❌ Error updating Spotify radio playlist: %s", e, exc_info=True)
 
 
 def create_spotify_playlist_for_file(
-    sp: SpotifyAPI, date_str: str, found_uris: list[str]
+    sp: SpotifyAPI,
+    date_str: str,
+    found_uris: list[str],
+    playlists_by_name: dict[str, str] | None = None,
 ) -> str | None:
-    """Create or update a per-day Spotify playlist."""
+    """Create or update a per-day Spotify playlist.
+
+    When playlists_by_name is given it is used (and kept up to date) instead of
+    looking the playlist up on Spotify for every file.
+    """
     if not found_uris:
         return None
 
     playlist_name = f"{date_str} History Set"
+    unique_uris = list(dict.fromkeys(found_uris))
 
     try:
-        existing = sp.find_playlist_by_name(playlist_name)
-        if existing:
-            playlist_id = existing["id"]
-            sp.add_tracks_to_specific_playlist(playlist_id, found_uris)
-            return playlist_id
+        if playlists_by_name is None:
+            existing = sp.find_playlist_by_name(playlist_name)
+            existing_id = existing["id"] if existing else None
+        else:
+            existing_id = playlists_by_name.get(playlist_name)
+
+        if existing_id:
+            try:
+                existing_uris = fetch_playlist_track_uris(sp, existing_id)
+            except Exception as e:
+                # Adding duplicates beats dropping tracks for a file Processed records.
+                log.warning(
+                    "⚠️ Could not list tracks of '%s', adding all: %s",
+                    playlist_name,
+                    e,
+                )
+                existing_uris = set()
+            new_uris = [u for u in unique_uris if u not in existing_uris]
+            if new_uris:
+                add_tracks_in_batches(sp, existing_id, new_uris)
+            else:
+                log.info("⏭ '%s' already has all tracks", playlist_name)
+            return existing_id
 
         playlist_id = sp.create_playlist(playlist_name, DEFAULT_PLAYLIST_DESCRIPTION)
         if not playlist_id:
             return None
+        if playlists_by_name is not None:
+            playlists_by_name[playlist_name] = playlist_id
 
-        unique_uris = list(dict.fromkeys(found_uris))
-        sp.add_tracks_to_specific_playlist(playlist_id, unique_uris)
+        add_tracks_in_batches(sp, playlist_id, unique_uris)
         return playlist_id
 
     except Exception as e:
         log.error(
-            f"❌ Failed creating/updating playlist '{playlist_name}': {e}",
+            "❌ Failed creating/updating playlist '%s': %s",
+            playlist_name,
+            e,
             exc_info=True,
         )
         return None
 
 
-def process_file(
+def scan_file(
     file: dict,
     processed_map: dict[str, str],
     g: GoogleAPI,
     m3u_tool: M3UToolbox,
     sp: SpotifyAPI,
-    logger: SpreadsheetLogger,
-) -> None:
+    spreadsheet_id: str,
+    search_cache: dict[tuple[str, str], str | None] | None = None,
+) -> dict | None:
+    """Download and parse one M3U file and search Spotify for its new songs.
+
+    Nothing is written to Spotify playlists or the log sheets; pass the result to
+    apply_file_result. Returns None when the file has no new songs.
+    """
     filename = file["name"]
     file_id = file["id"]
-    date = extract_date_from_filename(filename)
+    log.info("➡️ Processing M3U file: %s", filename)
 
     temp_path = os.path.join(tempfile.gettempdir(), f"{file_id}_{filename}")
 
     try:
-        g.drive.download_file(file_id, temp_path)
+        with _google_lock:
+            g.drive.download_file(file_id, temp_path)
 
-        # parse_m3u returns (artist, title, extvdj_line)
-        songs = m3u_tool.parse.parse_m3u(None, temp_path, logger.spreadsheet_id)
+            # parse_m3u returns (artist, title, extvdj_line)
+            songs = m3u_tool.parse.parse_m3u(None, temp_path, spreadsheet_id)
+    finally:
+        with suppress(OSError):
+            Path(temp_path).unlink(missing_ok=True)
 
-        last_extvdj_line = processed_map.get(filename)
-        new_songs = process_new_songs(songs, last_extvdj_line)
+    last_extvdj_line = processed_map.get(filename)
+    new_songs = process_new_songs(songs, last_extvdj_line)
 
-        if not new_songs:
-            log.info(f"⏭ No new songs found in {filename}")
-            return
+    if not new_songs:
+        log.info("⏭ No new songs found in %s", filename)
+        return None
 
-        found_uris: list[str] = []
-        matched_songs: list[tuple[str, str]] = []
-        unfound: list[tuple[str, str, str]] = []
+    found_uris: list[str] = []
+    matched_songs: list[tuple[str, str]] = []
+    unfound: list[tuple[str, str, str]] = []
+
+    uris = search_tracks(sp, new_songs, search_cache)
+    for (artist, title, extvdj_line), uri in zip(new_songs, uris):
+        if uri:
+            found_uris.append(uri)
+            matched_songs.append((artist, title))
+        else:
+            unfound.append((artist, title, extvdj_line))
+
+    log.info(
+        "🔎 %s: %d found on Spotify, %d not found",
+        filename,
+        len(matched_songs),
+        len(unfound),
+    )
 
-        for artist, title, extvdj_line in new_songs:
-            uri = sp.search_track(artist, title)
-            if uri:
-                found_uris.append(uri)
-                matched_songs.append((artist, title))
-            else:
-                unfound.append((artist, title, extvdj_line))
+    return {
+        "filename": filename,
+        "date": extract_date_from_filename(filename),
+        "new_songs": new_songs,
+        "last_extvdj_line": last_extvdj_line,
+        "found_uris": found_uris,
+        "matched_songs": matched_songs,
+        "unfound": unfound,
+    }
 
-        log.info(
-            f"🔎 {filename}: {len(matched_songs)} found on Spotify, {len(unfound)} not found"
-        )
 
-        update_spotify_radio_playlist(sp, config.SPOTIFY_PLAYLIST_ID, found_uris)
-        playlist_id = create_spotify_playlist_for_file(sp, date, found_uris)
-
-        logger.log_to_sheets(
-            date,
-            matched_songs,
-            found_uris,
-            unfound,
-            filename,
-            new_songs,
-            last_extvdj_line,
-            playlist_id=playlist_id,
-        )
+def apply_file_result(
+    result: dict,
+    processed_map: dict[str, str],
+    sp: SpotifyAPI,
+    logger: SpreadsheetLogger,
+    playlists_by_name: dict[str, str] | None = None,
+) -> list[str]:
+    """Update the per-day playlist and the log sheets for a scan_file result.
 
-        processed_map[filename] = new_songs[-1][2]
+    Returns the found URIs so callers can append all files to the radio playlist
+    in one go.
+    """
+    filename = result["filename"]
+    playlist_id = create_spotify_playlist_for_file(
+        sp, result["date"], result["found_uris"], playlists_by_name
+    )
 
-    finally:
-        try:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-        except Exception:
-            pass
+    logger.log_to_sheets(
+        result["date"],
+        result["matched_songs"],
+        result["found_uris"],
+        result["unfound"],
+        filename,
+        result["new_songs"],
+        result["last_extvdj_line"],
+        playlist_id=playlist_id,
+    )
+
+    processed_map[filename] = result["new_songs"][-1][2]
+    return result["found_uris"]
 
 
 def main() -> None:
@@ -324,9 +547,21 @@ def main() -> None:
 
     # Build a JSON snapshot of all playlists visible to this Spotify account.
     # This is useful for rendering playlist lists on the website, similar to DJ set collection snapshots.
-    snapshot_path = write_playlist_snapshot_json(sp)
+    # The listing is best-effort: without it the previous snapshot is kept (an
+    # empty one would blank the website) and per-day playlists are resolved with
+    # find_playlist_by_name instead.
+    try:
+        raw_playlists = fetch_all_playlists(sp)
+    except Exception as e:
+        log.error("❌ Failed to list Spotify playlists: %s", e, exc_info=True)
+        raw_playlists = None
+    snapshot_path = (
+        write_playlist_snapshot_json(sp, raw_playlists)
+        if raw_playlists is not None
+        else None
+    )
     if snapshot_path:
-        log.info(f"🧾 Wrote Spotify playlist snapshot JSON to: {snapshot_path}")
+        log.info("🧾 Wrote Spotify playlist snapshot JSON to: %s", snapshot_path)
     else:
         log.warning(
             "⚠️ Spotify playlist snapshot JSON was not written (see logs above)."
@@ -340,20 +575,81 @@ def main() -> None:
         folder_id=config.HISTORY_TO_SPOTIFY_FOLDER_ID,
         spreadsheet_name=config.HISTORY_TO_SPOTIFY_SPREADSHEET_NAME,
     )
-    log.info(f"📄 Logging spreadsheet ready (ID: {logger.spreadsheet_id})")
+    log.info("📄 Logging spreadsheet ready (ID: %s)", logger.spreadsheet_id)
     logger.log_start()
 
-    m3u_files = g.drive.get_all_m3u_files()
-    log.info(f"🎶 Found {len(m3u_files)} .m3u files to process")
+    m3u_files = list_m3u_files(g)
+    log.info("🎶 Found %d .m3u files to process", len(m3u_files))
     if not m3u_files:
         logger.log_info_sheet("❌ No .m3u files found.")
         return
 
     processed_map = logger.load_processed_map()
 
-    for file in m3u_files:
-        log.info(f"➡️ Processing M3U file: {file.get('name')}")
-        process_file(file, processed_map, g, m3u_tool, sp, logger)
+    # Reuse the snapshot listing to resolve per-day playlists without a lookup per file.
+    # If nothing could be listed, fall back to find_playlist_by_name.
+    playlists_by_name = index_playlists_by_name(raw_playlists or []) or None
+
+    # Sheets writes for every file are queued and flushed once at the end (a failed
+    # Processed write fails the run), and the radio playlist gets a single add + trim.
+    radio_uris: list[str] = []
+    search_cache: dict[tuple[str, str], str | None] = {}
+    # Optional SQLite file persisting Spotify search results between runs.
+    search_cache_path = os.getenv("SPOTIFY_SEARCH_CACHE_PATH")
+    if search_cache_path:
+        search_cache = load_search_cache(search_cache_path)
+        log.info("🗃 Loaded %d cached Spotify searches", len(search_cache))
+    cached_keys = set(search_cache)
+    # Downloads and searches run on a thread pool; playlist updates and log rows are
+    # then applied in file order, so sheets and same-date playlists stay ordered.
+    errors: list[Exception] = []
+    with logger.batched():
+        try:
+            workers = min(config.SYNC_FILE_WORKERS, len(m3u_files))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        scan_file,
+                        file,
+                        processed_map,
+                        g,
+                        m3u_tool,
+                        sp,
+                        logger.spreadsheet_id,
+                        search_cache,
+                    )
+                    for file in m3u_files
+                ]
+                # Apply every file's result even if one fails, so tracks from files
+                # already marked processed still reach the radio playlist.
+                for file, future in zip(m3u_files, futures):
+                    try:
+                        result = future.result()
+                        if result is not None:
+                            radio_uris.extend(
+                                apply_file_result(
+                                    result, processed_map, sp, logger, playlists_by_name
+                                )
+                            )
+                    except Exception as e:
+                        log.error(
+                            "❌ Failed processing %s: %s",
+                            file.get("name"),
+                            e,
+                            exc_info=True,
+                        )
+                        errors.append(e)
+        finally:
+            update_spotify_radio_playlist(sp, config.SPOTIFY_PLAYLIST_ID, radio_uris)
+
+    if search_cache_path:
+        save_search_cache(
+            search_cache_path,
+            {k: v for k, v in search_cache.items() if k not in cached_keys},
+        )
+
+    if errors:
+        raise errors[0]
 
     logger.format()
     log.info("🏁 Spotify history sync complete")
@@ -0,0 +1,30 @@
+from spotify_playlist_generator import get_spotify_refresh_token
+
+
+class _FakeOAuth:
+    last_kwargs: dict = {}
+
+    def __init__(self, **kwargs):
+        type(self).last_kwargs = kwargs
+
+    def get_cached_token(self):
+        return {"refresh_token": "cached-token"}
+
+    def get_access_token(self, as_dict=True):
+        return None
+
+
+def test_credentials_are_read_when_called(monkeypatch):
+    monkeypatch.setattr(get_spotify_refresh_token, "SpotifyOAuth", _FakeOAuth)
+    # Set after import, as load_dotenv() in main() would.
+    monkeypatch.setenv("SPOTIPY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("SPOTIPY_CLIENT_SECRET", "client-secret")
+
+    assert get_spotify_refresh_token.get_refresh_token(cached=True) == "cached-token"
+    assert _FakeOAuth.last_kwargs["client_id"] == "client-id"
+    assert _FakeOAuth.last_kwargs["client_secret"] == "client-secret"
+
+
+def test_missing_token_returns_none(monkeypatch):
+    monkeypatch.setattr(get_spotify_refresh_token, "SpotifyOAuth", _FakeOAuth)
+    assert get_spotify_refresh_token.get_refresh_token() is None
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+
+from spotify_playlist_generator import rate_limit
+from spotify_playlist_generator.rate_limit import TokenBucket
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Replace the module's clock with a fake one that sleep() advances."""
+    now = [100.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(
+        rate_limit, "time", SimpleNamespace(monotonic=lambda: now[0], sleep=sleep)
+    )
+    return sleeps
+
+
+def test_burst_is_served_without_waiting(sleeps):
+    bucket = TokenBucket(rate=10, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert sleeps == []
+
+
+def test_throttles_once_burst_is_spent(sleeps):
+    bucket = TokenBucket(rate=10, burst=3)
+    for _ in range(5):
+        bucket.acquire()
+    assert len(sleeps) == 2
+    assert sum(sleeps) == pytest.approx(0.2)
+
+
+def test_idle_refill_is_capped_at_burst(sleeps):
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    sleeps.clear()
+
+    # A long idle period refills to the burst size, not beyond it.
+    rate_limit.time.sleep(60)
+    sleeps.clear()
+    for _ in range(3):
+        bucket.acquire()
+    assert len(sleeps) == 1
+    assert sleeps[0] == pytest.approx(0.1)
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("kaiano")
+
+from spotify_playlist_generator import search_cache  # noqa: E402
+from spotify_playlist_generator.search_cache import (  # noqa: E402
+    MISS_TTL_SECONDS,
+    load_search_cache,
+    save_search_cache,
+)
+
+
+@pytest.fixture
+def set_now(monkeypatch):
+    def _set(ts):
+        monkeypatch.setattr(search_cache, "time", SimpleNamespace(time=lambda: ts))
+
+    return _set
+
+
+def test_round_trip_keeps_hits_and_fresh_misses(tmp_path, set_now):
+    path = str(tmp_path / "cache.sqlite")
+    entries = {("artist", "title"): "spotify:track:1", ("other", "song"): None}
+
+    set_now(1_000_000.0)
+    save_search_cache(path, entries)
+
+    assert load_search_cache(path) == entries
+
+
+def test_expired_misses_are_dropped(tmp_path, set_now):
+    path = str(tmp_path / "cache.sqlite")
+    set_now(1_000_000.0)
+    save_search_cache(path, {("a", "hit"): "spotify:track:1", ("a", "miss"): None})
+
+    set_now(1_000_000.0 + MISS_TTL_SECONDS + 1)
+    assert load_search_cache(path) == {("a", "hit"): "spotify:track:1"}
+
+
+def test_save_replaces_existing_entries(tmp_path, set_now):
+    path = str(tmp_path / "cache.sqlite")
+    set_now(1_000_000.0)
+    save_search_cache(path, {("a", "t"): None})
+    save_search_cache(path, {("a", "t"): "spotify:track:2"})
+
+    assert load_search_cache(path) == {("a", "t"): "spotify:track:2"}
+
+
+def test_missing_file_loads_empty(tmp_path):
+    assert load_search_cache(str(tmp_path / "missing.sqlite")) == {}
+
+
+def test_nothing_is_written_for_empty_entries(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    save_search_cache(str(path), {})
+    assert not path.exists()
+
+
+def test_unwritable_cache_directory_is_only_logged(tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+
+    save_search_cache(str(blocker / "cache.sqlite"), {("a", "t"): None})
+
+    assert blocker.is_file()
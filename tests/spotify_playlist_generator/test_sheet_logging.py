@@ -0,0 +1,229 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("kaiano")
+
+from spotify_playlist_generator import sheet_logging  # noqa: E402
+from spotify_playlist_generator.sheet_logging import (  # noqa: E402
+    REQUIRED_SHEETS,
+    SpreadsheetLogger,
+)
+
+SHEET_IDS = {title: i for i, title in enumerate(REQUIRED_SHEETS, start=1)}
+
+
+def _metadata(titles):
+    return {
+        "sheets": [
+            {"properties": {"sheetId": sheet_id, "title": title}}
+            for title, sheet_id in titles.items()
+        ]
+    }
+
+
+def _drive_listing():
+    return [
+        SimpleNamespace(
+            id="sheet-id",
+            name="Sync Log",
+            mime_type="application/vnd.google-apps.spreadsheet",
+        )
+    ]
+
+
+def _make_logger(processed_rows=()):
+    g = MagicMock()
+    g.drive.list_files.return_value = _drive_listing()
+    g.sheets.get_metadata.return_value = _metadata(SHEET_IDS)
+    g.sheets.read_values.return_value = [list(row) for row in processed_rows]
+    logger = SpreadsheetLogger(g, folder_id="folder", spreadsheet_name="Sync Log")
+    g.sheets.batch_update.reset_mock()
+    return logger, g
+
+
+def _request_kinds(call):
+    return [next(iter(request)) for request in call.args[1]]
+
+
+def _cell_values(row_data):
+    return [cell["userEnteredValue"]["stringValue"] for cell in row_data["values"]]
+
+
+def test_writes_are_sent_immediately_outside_batched():
+    logger, g = _make_logger()
+    logger.log_info_sheet("hello")
+    assert g.sheets.batch_update.call_count == 1
+    assert _request_kinds(g.sheets.batch_update.call_args) == ["appendCells"]
+
+
+def _log_one_file(logger):
+    logger.log_to_sheets(
+        "2024-03-01",
+        [("Artist", "Song")],
+        ["spotify:track:1"],
+        [("Other", "Missing", "2024-03-01 b")],
+        "2024-03-01.m3u",
+        [("Artist", "Song", "2024-03-01 a"), ("Other", "Missing", "2024-03-01 b")],
+        None,
+        playlist_id="pl1",
+    )
+
+
+def test_batched_queues_until_exit_then_rewrites_processed():
+    logger, g = _make_logger(processed_rows=[["old.m3u", "pl0", "2024-01-01 line"]])
+
+    with logger.batched():
+        _log_one_file(logger)
+        logger.log_info_sheet("second message")
+        g.sheets.batch_update.assert_not_called()
+
+    log_call, processed_call = g.sheets.batch_update.call_args_list
+    assert _request_kinds(log_call) == ["appendCells"] * 4
+    assert _request_kinds(processed_call) == ["updateCells"]
+
+    update = processed_call.args[1][0]["updateCells"]
+    assert update["range"]["sheetId"] == SHEET_IDS["Processed"]
+    assert update["range"]["startRowIndex"] == 1
+    # Newest ExtVDJ line first, existing rows kept.
+    assert [_cell_values(row) for row in update["rows"]] == [
+        ["2024-03-01.m3u", "pl1", "2024-03-01 b"],
+        ["old.m3u", "pl0", "2024-01-01 line"],
+    ]
+    assert logger.load_processed_map() == {
+        "2024-03-01.m3u": "2024-03-01 b",
+        "old.m3u": "2024-01-01 line",
+    }
+
+
+def test_failed_log_rows_are_only_logged():
+    logger, g = _make_logger()
+    g.sheets.batch_update.side_effect = RuntimeError("quota")
+    logger.log_info_sheet("hello")
+
+
+def test_failed_processed_write_raises_and_stays_dirty():
+    logger, g = _make_logger()
+    g.sheets.batch_update.side_effect = [None, RuntimeError("rejected")]
+
+    with pytest.raises(RuntimeError, match="rejected"):
+        with logger.batched():
+            logger.log_spreadsheet(
+                info_message="file",
+                processed_update={"filename": "a.m3u", "extvdj_line": "line"},
+            )
+
+    g.sheets.batch_update.side_effect = None
+    g.sheets.batch_update.reset_mock()
+    logger.flush()
+    assert _request_kinds(g.sheets.batch_update.call_args) == ["updateCells"]
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Fake clock advanced by sleep(); jitter is pinned to its 25% maximum."""
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(
+        sheet_logging, "time", SimpleNamespace(monotonic=lambda: now[0], sleep=sleep)
+    )
+    monkeypatch.setattr(
+        sheet_logging, "random", SimpleNamespace(uniform=lambda a, b: b)
+    )
+    return sleeps
+
+
+def _bare_logger(g):
+    logger = SpreadsheetLogger.__new__(SpreadsheetLogger)
+    logger.g = g
+    logger._meta_cache = None
+    return logger
+
+
+def test_wait_for_spreadsheet_ready_backs_off_until_metadata_loads(sleeps):
+    g = MagicMock()
+    g.sheets.get_metadata.side_effect = [RuntimeError("404"), RuntimeError("404"), {}]
+    logger = _bare_logger(g)
+
+    assert logger._wait_for_spreadsheet_ready("sheet-id", initial=0.1, base=2.0)
+
+    assert sleeps == pytest.approx([0.125, 0.25])
+    assert logger._meta_cache[1] == {}
+
+
+def test_wait_for_spreadsheet_ready_gives_up_after_max_wait(sleeps):
+    g = MagicMock()
+    g.sheets.get_metadata.side_effect = RuntimeError("404")
+    logger = _bare_logger(g)
+
+    assert not logger._wait_for_spreadsheet_ready(
+        "sheet-id", initial=1.0, base=2.0, max_wait=10.0
+    )
+
+    assert sleeps == pytest.approx([1.25, 2.5, 5.0, 1.25])
+
+
+def test_failed_extra_sheet_cleanup_does_not_stop_setup():
+    g = MagicMock()
+    g.drive.list_files.return_value = _drive_listing()
+    g.sheets.get_metadata.return_value = _metadata({**SHEET_IDS, "Sheet1": 99})
+    g.sheets.batch_update.side_effect = RuntimeError("cannot delete")
+
+    logger = SpreadsheetLogger(g, folder_id="folder", spreadsheet_name="Sync Log")
+
+    assert logger.spreadsheet_id == "sheet-id"
+    assert _request_kinds(g.sheets.batch_update.call_args) == ["deleteSheet"]
+
+
+def test_processed_grid_is_grown_before_rewrite():
+    logger, g = _make_logger(
+        processed_rows=[[f"old{i}.m3u", "pl0", f"2024-01-0{i} line"] for i in range(4)]
+    )
+    logger._processed_grid_rows = 3
+
+    with logger.batched():
+        _log_one_file(logger)
+
+    # Header plus five rows needs six; the tab has three.
+    processed_call = g.sheets.batch_update.call_args_list[-1]
+    assert _request_kinds(processed_call) == ["appendDimension", "updateCells"]
+    append = processed_call.args[1][0]["appendDimension"]
+    assert append == {
+        "sheetId": SHEET_IDS["Processed"],
+        "dimension": "ROWS",
+        "length": 3,
+    }
+
+    # The grown size is remembered, so the next rewrite only adds what it needs.
+    g.sheets.batch_update.reset_mock()
+    logger.log_spreadsheet(
+        processed_update={"filename": "new.m3u", "extvdj_line": "2024-04-01 line"}
+    )
+    append = g.sheets.batch_update.call_args.args[1][0]["appendDimension"]
+    assert append["length"] == 1
+
+
+def test_processed_grid_size_is_read_from_metadata():
+    g = MagicMock()
+    g.drive.list_files.return_value = _drive_listing()
+    metadata = _metadata(SHEET_IDS)
+    for sheet in metadata["sheets"]:
+        sheet["properties"]["gridProperties"] = {"rowCount": 2}
+    g.sheets.get_metadata.return_value = metadata
+    g.sheets.read_values.return_value = [["a.m3u", "pl", "line"]]
+    logger = SpreadsheetLogger(g, folder_id="folder", spreadsheet_name="Sync Log")
+
+    logger.log_spreadsheet(
+        processed_update={"filename": "b.m3u", "extvdj_line": "line 2"}
+    )
+
+    assert _request_kinds(g.sheets.batch_update.call_args) == [
+        "appendDimension",
+        "updateCells",
+    ]
@@ -4,6 +4,379 @@ These tests mock all external dependencies (Google, Spotify, etc.)
 and validate flow control, logging, and error handling.
 """
 
+import json
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("kaiano")
+
+from spotify_playlist_generator import sync  # noqa: E402
+
+SONGS = [
+    ("A", "One", "line-1"),
+    ("B", "Two", "line-2"),
+    ("C", "Three", "line-3"),
+]
+
 
 def test_process_new_songs_handles_existing_and_missing():
-    pass
+    assert sync.process_new_songs(SONGS, "line-1") == SONGS[1:]
+    assert sync.process_new_songs(SONGS, "line-3") == []
+    # No previous line, or one no longer in the file: everything is new.
+    assert sync.process_new_songs(SONGS, None) == SONGS
+    assert sync.process_new_songs(SONGS, "gone") == SONGS
+    assert sync.process_new_songs([], "line-1") == []
+
+
+def test_search_tracks_dedupes_within_batch_and_fills_cache():
+    sp = MagicMock()
+    sp.search_track.side_effect = lambda artist, title: (
+        None if title == "Unknown" else f"uri:{artist}:{title}"
+    )
+    songs = [
+        ("Artist", "Song", "l1"),
+        ("artist ", "SONG", "l2"),
+        ("Other", "Unknown", "l3"),
+        ("Artist", "Song", "l4"),
+    ]
+    cache = {}
+
+    uris = sync.search_tracks(sp, songs, cache)
+
+    assert uris == ["uri:Artist:Song", "uri:Artist:Song", None, "uri:Artist:Song"]
+    assert sp.search_track.call_count == 2
+    assert cache == {
+        ("artist", "song"): "uri:Artist:Song",
+        ("other", "unknown"): None,
+    }
+
+    # Hits and misses are both served from the cache on later files.
+    sp.search_track.reset_mock()
+    assert sync.search_tracks(sp, songs[2:], cache) == [None, "uri:Artist:Song"]
+    sp.search_track.assert_not_called()
+
+
+def test_natural_sort_key_orders_numbers_numerically():
+    names = ["set10.m3u", "Set9.m3u", "2024-01-02.m3u", "2023-12-31 late.m3u"]
+    assert sorted(names, key=sync._natural_sort_key) == [
+        "2023-12-31 late.m3u",
+        "2024-01-02.m3u",
+        "Set9.m3u",
+        "set10.m3u",
+    ]
+
+
+def test_list_m3u_files_filters_and_sorts():
+    g = MagicMock()
+    g.drive.list_files.return_value = [
+        SimpleNamespace(id="3", name="set10.M3U"),
+        SimpleNamespace(id="1", name="notes.txt"),
+        SimpleNamespace(id="2", name="set9.m3u"),
+        SimpleNamespace(id="4", name=None),
+    ]
+    assert sync.list_m3u_files(g) == [
+        {"id": "2", "name": "set9.m3u"},
+        {"id": "3", "name": "set10.M3U"},
+    ]
+
+
+class _PagedClient:
+    def __init__(self, total, limit=50):
+        self.total = total
+        self.limit = limit
+        self.offsets = []
+        self._lock = threading.Lock()
+
+    def current_user_playlists(self, limit, offset):
+        with self._lock:
+            self.offsets.append(offset)
+        end = min(offset + limit, self.total)
+        return {
+            "items": [{"id": str(i)} for i in range(offset, end)],
+            "total": self.total,
+            "next": "more" if end < self.total else None,
+        }
+
+
+class _Wrapper:
+    def __init__(self, client):
+        self._sp = client
+
+
+def test_fetch_all_playlists_fetches_remaining_pages_from_total():
+    client = _PagedClient(total=137)
+
+    playlists = sync.fetch_all_playlists(_Wrapper(client))
+
+    assert [p["id"] for p in playlists] == [str(i) for i in range(137)]
+    assert sorted(client.offsets) == [0, 50, 100]
+
+
+def test_fetch_all_playlists_single_page():
+    client = _PagedClient(total=10)
+    assert len(sync.fetch_all_playlists(_Wrapper(client))) == 10
+    assert client.offsets == [0]
+
+
+class _WrapperWithUserHelper(_Wrapper):
+    def get_playlists(self, user_id):
+        return [{"id": "from-helper"}]
+
+
+def test_fetch_all_playlists_falls_back_to_client_when_helper_fails():
+    client = _PagedClient(total=3)
+    playlists = sync.fetch_all_playlists(_WrapperWithUserHelper(client))
+    assert [p["id"] for p in playlists] == ["0", "1", "2"]
+
+
+def test_fetch_all_playlists_raises_when_helper_fails_without_client():
+    with pytest.raises(TypeError):
+        sync.fetch_all_playlists(_WrapperWithUserHelper(None))
+
+
+class _FakeSpotify:
+    """SpotifyAPI stand-in wrapping a spotipy-like client that holds one playlist."""
+
+    def __init__(self, existing_uris=()):
+        self._sp = SimpleNamespace(playlist_items=self._playlist_items)
+        self.existing_uris = list(existing_uris)
+        self.added = []
+        self.created = []
+
+    def _playlist_items(self, playlist_id, fields, limit, offset):
+        page = self.existing_uris[offset : offset + limit]
+        return {
+            "items": [{"track": {"uri": uri}} for uri in page],
+            "next": "more" if offset + limit < len(self.existing_uris) else None,
+        }
+
+    def add_tracks_to_specific_playlist(self, playlist_id, uris):
+        self.added.append((playlist_id, list(uris)))
+
+    def create_playlist(self, name, description):
+        self.created.append(name)
+        return "new-id"
+
+
+def test_existing_day_playlist_only_gets_missing_tracks():
+    sp = _FakeSpotify(existing_uris=[f"u{i}" for i in range(150)])
+    playlists = {"2024-03-01 History Set": "day-id"}
+
+    playlist_id = sync.create_spotify_playlist_for_file(
+        sp, "2024-03-01", ["u1", "new1", "new1", "u149", "new2"], playlists
+    )
+
+    assert playlist_id == "day-id"
+    assert sp.added == [("day-id", ["new1", "new2"])]
+    assert sp.created == []
+
+
+def test_existing_day_playlist_with_every_track_is_not_touched():
+    sp = _FakeSpotify(existing_uris=["u1", "u2"])
+    playlists = {"2024-03-01 History Set": "day-id"}
+
+    playlist_id = sync.create_spotify_playlist_for_file(
+        sp, "2024-03-01", ["u2", "u1"], playlists
+    )
+
+    assert playlist_id == "day-id"
+    assert sp.added == []
+
+
+def test_new_day_playlist_is_created_and_indexed():
+    sp = _FakeSpotify()
+    playlists = {}
+
+    playlist_id = sync.create_spotify_playlist_for_file(
+        sp, "2024-03-02", ["u1", "u1", "u2"], playlists
+    )
+
+    assert playlist_id == "new-id"
+    assert sp.created == ["2024-03-02 History Set"]
+    assert sp.added == [("new-id", ["u1", "u2"])]
+    assert playlists == {"2024-03-02 History Set": "new-id"}
+
+
+def test_existing_day_playlist_gets_every_track_when_listing_fails():
+    sp = _FakeSpotify(existing_uris=["u1"])
+
+    def broken_items(*args, **kwargs):
+        raise RuntimeError("502")
+
+    sp._sp.playlist_items = broken_items
+    playlists = {"2024-03-01 History Set": "day-id"}
+
+    playlist_id = sync.create_spotify_playlist_for_file(
+        sp, "2024-03-01", ["u1", "u2"], playlists
+    )
+
+    assert playlist_id == "day-id"
+    assert sp.added == [("day-id", ["u1", "u2"])]
+
+
+def test_playlist_snapshot_is_written_atomically(tmp_path, monkeypatch):
+    out = tmp_path / "site_data" / "spotify_playlists.json"
+    monkeypatch.setenv("SPOTIFY_PLAYLIST_SNAPSHOT_JSON_PATH", str(out))
+    raw = [{"id": "2", "name": "b"}, {"id": "1", "name": "A"}, "not a playlist"]
+
+    assert sync.write_playlist_snapshot_json(None, raw) == str(out)
+
+    snapshot = json.loads(out.read_text(encoding="utf-8"))
+    assert snapshot["playlist_count"] == 2
+    assert [p["id"] for p in snapshot["playlists"]] == ["1", "2"]
+    assert not out.with_name(out.name + ".tmp").exists()
+
+
+def test_failed_snapshot_write_keeps_previous_file(tmp_path, monkeypatch):
+    out = tmp_path / "spotify_playlists.json"
+    out.write_text("previous", encoding="utf-8")
+    monkeypatch.setenv("SPOTIFY_PLAYLIST_SNAPSHOT_JSON_PATH", str(out))
+
+    def broken_dump(obj, f, **kwargs):
+        f.write("{partial")
+        raise ValueError("boom")
+
+    monkeypatch.setattr(sync, "json", SimpleNamespace(dump=broken_dump))
+
+    assert sync.write_playlist_snapshot_json(None, [{"id": "1"}]) is None
+    assert out.read_text(encoding="utf-8") == "previous"
+    assert not out.with_name(out.name + ".tmp").exists()
+
+
+def test_add_tracks_in_batches_sends_at_most_100_uris_per_request():
+    sp = MagicMock()
+    uris = [f"spotify:track:{i}" for i in range(250)]
+
+    sync.add_tracks_in_batches(sp, "pl", uris)
+
+    calls = sp.add_tracks_to_specific_playlist.call_args_list
+    assert [len(call.args[1]) for call in calls] == [100, 100, 50]
+    assert [uri for call in calls for uri in call.args[1]] == uris
+    assert {call.args[0] for call in calls} == {"pl"}
+
+
+FILES = [{"id": str(i), "name": f"2024-03-0{i}.m3u"} for i in (1, 2, 3)]
+
+
+class _FakeLogger:
+    spreadsheet_id = "sheet-id"
+
+    def __init__(self, events):
+        self.events = events
+
+    def log_start(self):
+        pass
+
+    def load_processed_map(self):
+        return {}
+
+    @contextmanager
+    def batched(self):
+        try:
+            yield
+        finally:
+            self.events.append("flush")
+
+    def log_to_sheets(self, date, matched, found, unfound, filename, *args, **kwargs):
+        self.events.append(("log", filename))
+
+    def format(self):
+        self.events.append("format")
+
+    def log_info_sheet(self, message=None, *args):
+        self.events.append(("info", message))
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    """Run main() against fakes; scans of later files finish first."""
+    run = SimpleNamespace(events=[], playlists=[], fail=set())
+    logger = _FakeLogger(run.events)
+
+    def scan_file(file, processed_map, g, m3u_tool, sp, spreadsheet_id, cache=None):
+        name = file["name"]
+        time.sleep(0.02 * (len(FILES) - int(file["id"])))
+        if name in run.fail:
+            raise RuntimeError(f"cannot read {name}")
+        return {
+            "filename": name,
+            "date": name[:10],
+            "new_songs": [("Artist", "Title", f"{name} line")],
+            "last_extvdj_line": None,
+            "found_uris": [f"uri:{name}"],
+            "matched_songs": [("Artist", "Title")],
+            "unfound": [],
+        }
+
+    def create_playlist(sp, date, uris, playlists_by_name=None):
+        run.playlists.append(date)
+        return f"pl:{date}"
+
+    def update_radio(sp, playlist_id, uris):
+        run.events.append(("radio", list(uris)))
+
+    monkeypatch.delenv("SPOTIFY_SEARCH_CACHE_PATH", raising=False)
+    monkeypatch.setattr(sync, "load_dotenv", lambda: None)
+    monkeypatch.setattr(sync, "GoogleAPI", SimpleNamespace(from_env=lambda: "g"))
+    monkeypatch.setattr(sync, "SpotifyAPI", SimpleNamespace(from_env=lambda: "sp"))
+    monkeypatch.setattr(sync, "M3UToolbox", lambda: "m3u")
+    monkeypatch.setattr(sync, "fetch_all_playlists", lambda sp: [])
+    monkeypatch.setattr(sync, "write_playlist_snapshot_json", lambda *a: None)
+    monkeypatch.setattr(sync, "SpreadsheetLogger", lambda *a, **k: logger)
+    monkeypatch.setattr(sync, "list_m3u_files", lambda g: FILES)
+    monkeypatch.setattr(sync, "scan_file", scan_file)
+    monkeypatch.setattr(sync, "create_spotify_playlist_for_file", create_playlist)
+    monkeypatch.setattr(sync, "update_spotify_radio_playlist", update_radio)
+    return run
+
+
+def test_main_applies_files_in_order_and_adds_radio_once(fake_run):
+    sync.main()
+
+    assert fake_run.playlists == ["2024-03-01", "2024-03-02", "2024-03-03"]
+    assert fake_run.events == [
+        ("log", "2024-03-01.m3u"),
+        ("log", "2024-03-02.m3u"),
+        ("log", "2024-03-03.m3u"),
+        ("radio", ["uri:2024-03-01.m3u", "uri:2024-03-02.m3u", "uri:2024-03-03.m3u"]),
+        "flush",
+        "format",
+        ("info", "✅ Sync complete."),
+    ]
+
+
+def test_main_reraises_first_error_after_flush(fake_run):
+    fake_run.fail.add("2024-03-02.m3u")
+
+    with pytest.raises(RuntimeError, match="2024-03-02"):
+        sync.main()
+
+    # The other files are still applied and reach the radio playlist.
+    assert fake_run.events == [
+        ("log", "2024-03-01.m3u"),
+        ("log", "2024-03-03.m3u"),
+        ("radio", ["uri:2024-03-01.m3u", "uri:2024-03-03.m3u"]),
+        "flush",
+    ]
+
+
+def test_main_keeps_previous_snapshot_when_listing_fails(fake_run, monkeypatch):
+    written = []
+
+    def broken_listing(sp):
+        raise RuntimeError("listing failed")
+
+    monkeypatch.setattr(sync, "fetch_all_playlists", broken_listing)
+    monkeypatch.setattr(
+        sync, "write_playlist_snapshot_json", lambda *a: written.append(a)
+    )
+
+    sync.main()
+
+    assert written == []
+    assert fake_run.playlists == ["2024-03-01", "2024-03-02", "2024-03-03"]